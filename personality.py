@@ -0,0 +1,415 @@
+"""
+Lexicon-based text analysis behind the music → coffee personality app.
+Pure Python with no Streamlit dependency, so it can be imported on its own.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# =========================
+# 1. Lexicons: mood / energy / genre / context
+# =========================
+# Mood words: loosely inspired by emotion lexicons (e.g., NRC Emotion Lexicon)
+mood_lexicon: Dict[str, List[str]] = {
+    "chill": [
+        "calm", "relax", "relaxed", "chill", "peaceful", "soft",
+        "soothing", "smooth", "mellow", "gentle", "quiet", "cozy"
+    ],
+    "happy": [
+        "happy", "bright", "cheerful", "fun", "upbeat", "uplifting",
+        "joyful", "exciting", "excited", "optimistic", "hopeful"
+    ],
+    "sad": [
+        "sad", "melancholy", "blue", "lonely", "depressed",
+        "heartbroken", "down", "gloomy"
+    ],
+    "intense": [
+        "intense", "strong", "aggressive", "powerful", "heavy",
+        "hard", "raw", "angry"
+    ],
+    "nostalgic": [
+        "nostalgic", "old", "retro", "memory", "memories",
+        "throwback", "vintage", "classic", "childhood"
+    ],
+}
+
+# Energy words: adjectives + activity cues
+energy_lexicon: Dict[str, List[str]] = {
+    "high": [
+        "fast", "loud", "energetic", "dance", "party", "rock",
+        "run", "running", "jog", "workout", "gym", "cardio",
+        "intense", "hype", "powerful", "hard"
+    ],
+    "low": [
+        "slow", "soft", "quiet", "ambient", "background",
+        "sleep", "sleepy", "bedtime", "chill", "relax", "relaxed", "calm"
+    ],
+}
+
+# Genre words: loosely organized based on common Spotify / Last.fm style tags
+genre_lexicon: Dict[str, List[str]] = {
+    # chill / study vibes
+    "lofi": ["lofi", "lo-fi", "beat tape", "chillhop"],
+    "jazz": ["jazz", "sax", "saxophone", "swing", "bebop"],
+    "classical": ["classical", "piano", "orchestra", "symphony", "violin", "cello"],
+    "ambient": ["ambient", "drone", "soundscape"],
+
+    # rock family
+    "rock": ["rock", "metal", "punk", "hardcore", "alt-rock", "alternative"],
+    "indie": ["indie", "indie-rock", "indie-pop"],
+
+    # pop / dance / mainstream
+    "pop": ["pop", "kpop", "k-pop", "jpop", "j-pop", "c-pop", "cpop"],
+    "edm": ["edm", "electronic", "techno", "house", "trance", "dubstep"],
+    "hiphop": ["hiphop", "hip-hop", "rap", "trap"],
+
+    # groove / chill groove
+    "rnb": ["rnb", "r&b", "soul", "neo-soul", "funk"],
+
+    # roots / acoustic
+    "folk": ["folk", "acoustic", "singer-songwriter"],
+    "country": ["country", "bluegrass"],
+
+    # world / regional
+    "latin": ["latin", "reggaeton", "salsa", "bossa", "bossa nova"],
+    "reggae": ["reggae", "dub"],
+
+    # others
+    "soundtrack": ["soundtrack", "ost", "score", "movie score", "game music"],
+}
+
+# Listening context (situations)
+context_lexicon: Dict[str, List[str]] = {
+    "study": ["study", "studying", "homework", "exam", "reading", "library"],
+    "commute": ["commute", "bus", "train", "subway", "metro", "driving", "car", "walk", "walking"],
+    "workout": ["workout", "gym", "run", "running", "jog", "cardio", "exercise"],
+    "sleep": ["sleep", "sleepy", "bedtime", "before bed", "night", "fall asleep"],
+    "relax": ["relax", "relaxed", "relaxing", "chill", "weekend", "coffee", "cafe", "cozy"],
+    "party": ["party", "club", "dancefloor", "festival"],
+}
+
+_AXES: Dict[str, Dict[str, List[str]]] = {
+    "mood": mood_lexicon,
+    "energy": energy_lexicon,
+    "genre": genre_lexicon,
+    "context": context_lexicon,
+}
+_AXIS_NAMES: Tuple[str, ...] = tuple(_AXES)
+# Category names per axis, in lexicon order. Counts for all axes live in one
+# flat list: axis i owns the slots _OFFSETS[i] .. _OFFSETS[i] + len(_CATEGORIES[i]).
+_CATEGORIES: Tuple[Tuple[str, ...], ...] = tuple(tuple(lexicon) for lexicon in _AXES.values())
+_OFFSETS: Tuple[int, ...] = tuple(sum(len(cats) for cats in _CATEGORIES[:i]) for i in range(len(_CATEGORIES)))
+_N_SLOTS = sum(len(cats) for cats in _CATEGORIES)
+
+# Inverted index over all four lexicons: word → (slot, ...), where slot is the
+# position of each category containing the word in the flat counts list.
+# Lets the analysis scan the text once instead of once per lexicon.
+# Multi-word entries ("bossa nova", "before bed") are keyed by the full phrase.
+def _build_index() -> Dict[str, Tuple[int, ...]]:
+    index: Dict[str, List[int]] = {}
+    for axis_id, lexicon in enumerate(_AXES.values()):
+        for cat_id, words in enumerate(lexicon.values()):
+            slot = _OFFSETS[axis_id] + cat_id
+            for w in words:
+                slots = index.setdefault(w, [])
+                if slot not in slots:
+                    slots.append(slot)
+    return {w: tuple(slots) for w, slots in index.items()}
+
+
+_INDEX = _build_index()
+
+# =========================
+# 2. Preprocessing & counting
+# =========================
+
+# Runs of letters, optionally joined by "-", "'" or "&", so lexicon entries
+# such as "lo-fi", "hip-hop", "k-pop" and "r&b" survive tokenization intact.
+_TOKEN_RE = re.compile(r"[a-z]+(?:[-'&][a-z]+)*")
+
+
+def _trie_pattern(terms) -> str:
+    """
+    Regex source matching any of `terms`, factored into a prefix trie so the
+    engine never re-tries alternatives that share a prefix. Greedy optional
+    tails keep the longest entry ("indie-rock" over "indie").
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a term
+
+    def emit(node: dict) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + emit(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+# One pattern over every lexicon entry, scanned once over the raw text.
+# The boundaries mirror _TOKEN_RE, so an entry only matches as a whole token
+# (or a run of tokens, for phrases like "bossa nova").
+_TERM_RE = re.compile(
+    r"(?<![a-z])(?<![a-z][-'&])(?:" + _trie_pattern(_INDEX) + r")(?![a-z]|[-'&][a-z])"
+)
+
+
+@lru_cache(maxsize=4096)
+def preprocess(text: str) -> Tuple[str, ...]:
+    """
+    Lowercase + tokenize into words (keeping hyphenated words together).
+    Returns an immutable tuple of tokens, cached per input text.
+    """
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+def get_max_or_none(counts_dict: Dict[str, int]) -> Tuple[str, int]:
+    """Return the category with the highest count and its score (first one wins ties)."""
+    best_cat, best_v = None, -1
+    for k, v in counts_dict.items():
+        if v > best_v:
+            best_cat, best_v = k, v
+    return (best_cat, best_v) if best_v >= 0 else (None, 0)
+
+
+def decide_energy(energy_counts: Dict[str, int], context_counts: Dict[str, int]) -> str:
+    """
+    Decide overall energy level based on:
+    - explicit energy words
+    - plus listening context (workout/party → high, sleep/relax/study → low)
+    """
+    base_high = energy_counts["high"]
+    base_low = energy_counts["low"]
+
+    context_high = context_counts["workout"] + context_counts["party"]
+    context_low = context_counts["sleep"] + context_counts["relax"] + context_counts["study"]
+
+    total_high = base_high + context_high
+    total_low = base_low + context_low
+
+    if total_high > total_low:
+        return "high"
+    elif total_low > total_high:
+        return "low"
+    else:
+        return "mixed"
+
+# =========================
+# 3. Music persona → coffee persona
+# =========================
+
+# Option sets for the coffee rules below, built once instead of per call.
+_MATCHA_GENRES = frozenset({"lofi", "jazz", "ambient", "rnb"})
+_MATCHA_CONTEXTS = frozenset({"study", "relax", None})
+_ICED_GENRES = frozenset({"pop", "edm", "latin"})
+_ICED_CONTEXTS = frozenset({"commute", "workout", "party"})
+_ESPRESSO_GENRES = frozenset({"rock", "hiphop", "indie"})
+_HAND_BREW_GENRES = frozenset({"soundtrack", "folk"})
+_CARAMEL_GENRES = frozenset({"pop", "edm", "rnb", "latin"})
+_FLATWHITE_GENRES = frozenset({"classical", "jazz"})
+_FLATWHITE_CONTEXTS = frozenset({"study", "relax", "sleep"})
+
+
+def map_persona_to_coffee(
+    main_mood: str,
+    main_genre: str,
+    energy_level: str,
+    main_context: str,
+    mood_score: int,
+    genre_score: int,
+):
+    """
+    Map dominant mood / genre / energy / context into a coffee personality.
+    Includes several coffee types and a fallback when nothing matches.
+    """
+
+    # 0. No matches at all → Mystery Blend
+    if mood_score == 0 and genre_score == 0:
+        return (
+            "☕ Mystery Blend Coffee",
+            "From your description, I could not detect any of the mood/genre keywords "
+            "in this small lexicon. This suggests that your taste is either very unique "
+            "or simply outside my current database. You are like a mystery blend: "
+            "it takes time to discover all the flavors."
+        )
+
+    # 1. chill + lofi/jazz/ambient/R&B + study/relax + not high energy → Matcha Latte
+    if (
+        main_mood == "chill"
+        and main_genre in _MATCHA_GENRES
+        and energy_level != "high"
+        and main_context in _MATCHA_CONTEXTS
+    ):
+        return (
+            "🍵 Matcha Latte",
+            "You seem to enjoy calm, smooth, and atmospheric music (lofi / jazz / ambient / R&B), "
+            "often for studying or relaxing. Your music personality is like a matcha latte: "
+            "gentle, soothing, and a bit ritualistic."
+        )
+
+    # 2. high energy + pop/edm/latin + commute/workout/party → Iced Americano
+    if (
+        energy_level == "high"
+        and main_genre in _ICED_GENRES
+        and main_context in _ICED_CONTEXTS
+    ):
+        return (
+            "🧊 Iced Americano",
+            "Your playlist is bright, refreshing, and energetic (pop / EDM / Latin), "
+            "especially when you are on the move. You are like an iced Americano: "
+            "clear, sharp, and perfect for waking up your day."
+        )
+
+    # 3. high energy + rock/hiphop/indie + workout/party → Espresso Shot
+    if (
+        energy_level == "high"
+        and main_genre in _ESPRESSO_GENRES
+    ):
+        return (
+            "⚡ Espresso Shot",
+            "Your music is intense and full of impact (rock / metal / hip-hop / indie). "
+            "You are like an espresso shot: small but very strong."
+        )
+
+    # 4. nostalgic or soundtrack/folk/classic focus → Hand-brewed Black Coffee
+    if main_mood == "nostalgic" or main_genre in _HAND_BREW_GENRES:
+        return (
+            "☕ Hand-brewed Black Coffee",
+            "You gravitate towards music that carries stories and memories — soundtracks, "
+            "folk songs, or classics that remind you of specific moments. "
+            "Your music personality is like a hand-brewed black coffee: slow, thoughtful, and deep."
+        )
+
+    # 5. sad → Mocha
+    if main_mood == "sad":
+        return (
+            "🍫 Mocha",
+            "You resonate with emotional or slightly melancholic music. "
+            "You are like a mocha: a mix of bitterness and sweetness, with rich emotional flavor."
+        )
+
+    # 6. happy + pop/edm/rnb/latin → Caramel Macchiato
+    if main_mood == "happy" and main_genre in _CARAMEL_GENRES:
+        return (
+            "🍮 Caramel Macchiato",
+            "You enjoy cheerful, fun, and catchy songs. "
+            "Your music personality is like a caramel macchiato: sweet, playful, and crowd-pleasing."
+        )
+
+    # 7. classical / jazz + study/reading → Flat White
+    if main_genre in _FLATWHITE_GENRES and main_context in _FLATWHITE_CONTEXTS:
+        return (
+            "🥛 Flat White",
+            "You appreciate structure, detail, and balance in music (classical / jazz), "
+            "often as a companion for reading or quiet time. "
+            "Your music personality is like a flat white: refined, smooth, and carefully crafted."
+        )
+
+    # 8. default → House Blend
+    return (
+        "🫘 House Blend",
+        "Your music taste seems quite diverse and not dominated by any single mood or genre "
+        "in this lexicon. You are like a house blend: a balanced mix of different flavors."
+    )
+
+
+def _count_axes(text: str) -> Dict[str, Dict[str, int]]:
+    """
+    Counting pass: one scan over the text fills the count slots of all four
+    axes. Counts live in one flat, fixed-size list (see _OFFSETS) and are
+    returned as {axis: {category: count}}, in lexicon order.
+    """
+    # a plain list on purpose: array('i') stores unboxed C ints, so every
+    # read/increment would box and unbox, measured ~2.5x slower here
+    counts = [0] * _N_SLOTS
+
+    # repeated words are common in real descriptions, so tally the matches first
+    # and walk each distinct term once, adding its frequency
+    for term, freq in Counter(_TERM_RE.findall(text.lower())).items():
+        hits = _INDEX.get(term)
+        if hits is None:
+            # phrase typed with other whitespace, e.g. "bossa\nnova"
+            hits = _INDEX.get(" ".join(term.split()), ())
+        for slot in hits:
+            counts[slot] += freq
+
+    return {
+        axis: dict(zip(cats, counts[off:off + len(cats)]))
+        for axis, cats, off in zip(_AXIS_NAMES, _CATEGORIES, _OFFSETS)
+    }
+
+
+class Result(NamedTuple):
+    """
+    Immutable analysis result. Each *_counts field is a tuple of counts in the
+    category order of the matching lexicon (e.g. mood_lexicon's keys);
+    `count_dicts` turns them back into named dicts for display.
+    """
+    mood_counts: Tuple[int, ...]
+    energy_counts: Tuple[int, ...]
+    genre_counts: Tuple[int, ...]
+    context_counts: Tuple[int, ...]
+    main_mood: Optional[str]
+    main_mood_score: int
+    main_genre: Optional[str]
+    main_genre_score: int
+    main_context: Optional[str]
+    main_context_score: int
+    energy_level: str
+    coffee: str
+    explanation: str
+
+    def count_dicts(self) -> Dict[str, Dict[str, int]]:
+        """Counts per axis as {axis: {category: count}}."""
+        return {
+            axis: dict(zip(cats, getattr(self, f"{axis}_counts")))
+            for axis, cats in zip(_AXIS_NAMES, _CATEGORIES)
+        }
+
+
+def analyze_music_personality(text: str) -> Result:
+    """
+    Main analysis function: text → counts → coffee personality.
+    Counting scans the raw text directly; use `preprocess` to get the tokens.
+    """
+    counts = _count_axes(text)
+    mood_counts = counts["mood"]
+    energy_counts = counts["energy"]
+    genre_counts = counts["genre"]
+    context_counts = counts["context"]
+
+    main_mood, mood_score = get_max_or_none(mood_counts)
+    main_genre, genre_score = get_max_or_none(genre_counts)
+    main_context, context_score = get_max_or_none(context_counts)
+
+    energy_level = decide_energy(energy_counts, context_counts)
+
+    coffee, explanation = map_persona_to_coffee(
+        main_mood, main_genre, energy_level, main_context, mood_score, genre_score
+    )
+
+    return Result(
+        mood_counts=tuple(mood_counts.values()),
+        energy_counts=tuple(energy_counts.values()),
+        genre_counts=tuple(genre_counts.values()),
+        context_counts=tuple(context_counts.values()),
+        main_mood=main_mood,
+        main_mood_score=mood_score,
+        main_genre=main_genre,
+        main_genre_score=genre_score,
+        main_context=main_context,
+        main_context_score=context_score,
+        energy_level=energy_level,
+        coffee=coffee,
+        explanation=explanation,
+    )
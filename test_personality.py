@@ -0,0 +1,37 @@
+from personality import analyze_music_personality, preprocess
+
+
+def counts(text):
+    return analyze_music_personality(text).count_dicts()
+
+
+def test_longest_entry_wins():
+    genre = counts("indie-rock and bossa nova")["genre"]
+    assert genre["indie"] == 1
+    assert genre["rock"] == 0
+    assert genre["latin"] == 1  # "bossa nova", not also "bossa"
+
+
+def test_no_match_inside_hyphenated_token():
+    assert counts("post-rock")["genre"]["rock"] == 0
+    assert counts("synth-pop")["genre"]["pop"] == 0
+
+
+def test_phrase_split_by_other_whitespace():
+    assert counts("bossa\nnova")["genre"]["latin"] == 1
+    assert counts("before\t bed")["context"]["sleep"] == 1
+
+
+def test_tie_goes_to_first_listed_category():
+    res = analyze_music_personality("sad but chill")
+    assert (res.main_mood, res.main_mood_score) == ("chill", 1)
+
+
+def test_nothing_matched_is_mystery_blend():
+    res = analyze_music_personality("hello there")
+    assert res.main_mood_score == 0 and res.main_genre_score == 0
+    assert res.coffee == "☕ Mystery Blend Coffee"
+
+
+def test_preprocess_keeps_joined_words():
+    assert preprocess("Lo-Fi, R&B; don't!") == ("lo-fi", "r&b", "don't")